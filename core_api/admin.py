@@ -1,17 +1,60 @@
 # core_api/admin.py
 
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import (
-    CustomUser, Role, Permission, Plat, Commande, 
-    LigneCommande, Panier, LignePanier, Commune, 
-    ParametresRestaurant, Paiement
+    CustomUser, Role, Permission, Plat, Commande,
+    LigneCommande, Panier, LignePanier, Commune,
+    ParametresRestaurant, Paiement, CodePromo,
+    CommandeArchive, LigneCommandeArchive
 )
 
+# --- Pagination pour les grandes tables ---
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator qui évite le COUNT(*) complet sur les grandes tables non filtrées.
+    Sur PostgreSQL, l'estimation des statistiques (pg_class.reltuples) est utilisée ;
+    dès qu'un filtre ou une recherche est appliqué, on revient au COUNT exact.
+    """
+    # En dessous de ce seuil, le COUNT exact est assez rapide et plus juste
+    seuil_estimation = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                # reltuples vaut -1 (ou 0) tant que la table n'a jamais été analysée
+                if row and row[0] >= self.seuil_estimation:
+                    return row[0]
+        return super().count
+
+
+class GrandeTableAdmin(admin.ModelAdmin):
+    """
+    Base commune pour les modèles à fort volume (commandes, paiements, paniers).
+    """
+    paginator = EstimatedCountPaginator
+    # Évite le second COUNT(*) non filtré affiché dans "x résultats (y au total)"
+    show_full_result_count = False
+    list_per_page = 50
+
 # Configuration de l'affichage pour l'utilisateur personnalisé
 class CustomUserAdmin(admin.ModelAdmin):
     list_display = ('telephone', 'email', 'nom_complet', 'is_staff', 'is_active', 'role')
     search_fields = ('telephone', 'email', 'nom_complet')
     list_filter = ('is_staff', 'is_active', 'role')
+    list_select_related = ('role',)
 
 # Configuration pour les Rôles et Permissions (RBAC)
 class RoleAdmin(admin.ModelAdmin):
@@ -24,26 +67,93 @@ class PermissionAdmin(admin.ModelAdmin):
 
 # Configuration pour les Plats
 class PlatAdmin(admin.ModelAdmin):
-    list_display = ('nom', 'type', 'categorie', 'prix_base', 'statut')
+    list_display = ('nom', 'type', 'categorie', 'prix_base', 'statut', 'stock', 'stock_journalier')
     list_filter = ('type', 'categorie', 'statut')
     search_fields = ('nom', 'description')
-    
+
 # Configuration pour la Commande
 class LigneCommandeInline(admin.TabularInline):
     model = LigneCommande
     extra = 0
+    # Un <select> de tous les plats par ligne serait chargé à chaque affichage
+    autocomplete_fields = ('plat',)
 
-class CommandeAdmin(admin.ModelAdmin):
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('plat')
+
+class CommandeAdmin(GrandeTableAdmin):
     # Correction 1: Changement de 'id_client' à 'client'
     list_display = ('id', 'client', 'statut_commande', 'total', 'date_commande')
-    
+    list_select_related = ('client',)
+
     # Correction 2: Suppression du filtre 'mode_paiement' (champ non trouvé)
-    list_filter = ('statut_commande', 'date_commande') 
-    
+    list_filter = ('statut_commande', 'date_commande')
+    date_hierarchy = 'date_commande'
+
     # Correction 1: Changement de 'id_client__...' à 'client__...'
     search_fields = ('id', 'client__telephone', 'client__nom_complet')
+    raw_id_fields = ('client',)
     inlines = [LigneCommandeInline]
 
+# Configuration pour les Commandes archivées (lecture seule, voir archiver_commandes)
+class LigneCommandeArchiveInline(admin.TabularInline):
+    model = LigneCommandeArchive
+    extra = 0
+    can_delete = False
+    readonly_fields = ('plat', 'quantite', 'prix_unitaire', 'id_variation', 'personnalisation')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('plat')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+class CommandeArchiveAdmin(GrandeTableAdmin):
+    list_display = ('id', 'client', 'statut_commande', 'total', 'date_commande', 'date_archivage')
+    list_select_related = ('client',)
+    list_filter = ('statut_commande',)
+    date_hierarchy = 'date_commande'
+    search_fields = ('id', 'client__telephone', 'client__nom_complet')
+    inlines = [LigneCommandeArchiveInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Configuration pour les Paiements
+class PaiementAdmin(GrandeTableAdmin):
+    list_display = ('id', 'commande', 'mode', 'montant', 'statut', 'date_paiement')
+    list_select_related = ('commande',)
+    list_filter = ('mode', 'statut')
+    date_hierarchy = 'date_paiement'
+    search_fields = ('reference', 'commande__id')
+    raw_id_fields = ('commande',)
+
+# Configuration pour les Paniers
+class PanierAdmin(GrandeTableAdmin):
+    list_display = ('id', 'client', 'code_promo', 'reduction', 'created_at')
+    list_select_related = ('client',)
+    search_fields = ('client__telephone', 'code_promo')
+    raw_id_fields = ('client',)
+
+class LignePanierAdmin(GrandeTableAdmin):
+    list_display = ('id', 'panier', 'plat', 'quantite')
+    # Panier.__str__ affiche le téléphone du client : on le joint aussi
+    list_select_related = ('panier__client', 'plat')
+    raw_id_fields = ('panier',)
+    autocomplete_fields = ('plat',)
+
+# Configuration pour les Codes Promo
+class CodePromoAdmin(admin.ModelAdmin):
+    list_display = ('code', 'type_reduction', 'valeur', 'utilisations', 'utilisations_max', 'date_debut', 'date_fin', 'actif')
+    list_filter = ('actif', 'type_reduction')
+    search_fields = ('code', 'description')
+    autocomplete_fields = ('plats',)
+    # Incrémenté uniquement au checkout (core_api.promo.utiliser_code_promo)
+    readonly_fields = ('utilisations',)
+
 # Configuration pour les autres modèles
 class CommuneAdmin(admin.ModelAdmin):
     list_display = ('nom', 'frais_livraison')
@@ -55,9 +165,11 @@ admin.site.register(Permission, PermissionAdmin)
 
 admin.site.register(Plat, PlatAdmin)
 admin.site.register(Commande, CommandeAdmin)
+admin.site.register(CommandeArchive, CommandeArchiveAdmin)
 
 admin.site.register(Commune, CommuneAdmin)
-admin.site.register(ParametresRestaurant) 
-admin.site.register(Paiement)
-admin.site.register(Panier)
-admin.site.register(LignePanier)
\ No newline at end of file
+admin.site.register(ParametresRestaurant)
+admin.site.register(Paiement, PaiementAdmin)
+admin.site.register(Panier, PanierAdmin)
+admin.site.register(LignePanier, LignePanierAdmin)
+admin.site.register(CodePromo, CodePromoAdmin)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreApiConfig(AppConfig):
     name = 'core_api'
+
+    def ready(self):
+        # Connecte les signaux d'invalidation du cache du menu et des codes promo
+        from . import cache, promo  # noqa: F401
@@ -0,0 +1,82 @@
+# core_api/archives.py
+from django.db import models, transaction
+from django.db.models import Sum
+
+from .models import (
+    Commande, CommandeArchive, LigneCommande, LigneCommandeArchive,
+    Paiement, PaiementArchive
+)
+
+# Seules les commandes terminées sont archivées
+STATUTS_ARCHIVABLES = ('LIVREE', 'ANNULEE')
+
+# Colonnes communes à Commande et CommandeArchive, pour les lectures combinées
+CHAMPS_COMMANDE = [field.attname for field in Commande._meta.concrete_fields]
+
+
+def archiver_lot(seuil, taille_lot):
+    """
+    Déplace au plus `taille_lot` commandes LIVREE/ANNULEE antérieures à `seuil`
+    (avec leurs lignes et leur paiement) vers les tables d'archive.
+
+    Chaque lot est une transaction courte : les verrous ne portent que sur ces
+    commandes, et les lignes déjà verrouillées par une autre transaction sont
+    ignorées (SKIP LOCKED) plutôt qu'attendues. Retourne le nombre de commandes archivées.
+    """
+    with transaction.atomic():
+        ids = list(
+            Commande.objects
+            .select_for_update(skip_locked=True)
+            .filter(statut_commande__in=STATUTS_ARCHIVABLES, date_commande__lt=seuil)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:taille_lot]
+        )
+        if not ids:
+            return 0
+
+        CommandeArchive.objects.bulk_create(
+            CommandeArchive(**valeurs) for valeurs in Commande.objects.filter(pk__in=ids).values()
+        )
+        LigneCommandeArchive.objects.bulk_create(
+            LigneCommandeArchive(**valeurs) for valeurs in LigneCommande.objects.filter(commande_id__in=ids).values()
+        )
+        PaiementArchive.objects.bulk_create(
+            PaiementArchive(**valeurs) for valeurs in Paiement.objects.filter(commande_id__in=ids).values()
+        )
+
+        Paiement.objects.filter(commande_id__in=ids).delete()
+        LigneCommande.objects.filter(commande_id__in=ids).delete()
+        Commande.objects.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+def commandes_avec_archives(*conditions, **filtres):
+    """
+    Commandes en cours et archivées (UNION ALL), sous forme de dictionnaires
+    CHAMPS_COMMANDE + 'archivee'. Les conditions (Q) et filtres s'appliquent aux deux
+    tables : le résultat combiné ne peut plus être filtré, seulement trié et découpé.
+    Ex: commandes_avec_archives(client=user).order_by('-date_commande')
+    """
+    en_cours = (
+        Commande.objects.filter(*conditions, **filtres).values(*CHAMPS_COMMANDE)
+        .annotate(archivee=models.Value(False, output_field=models.BooleanField()))
+    )
+    archivees = (
+        CommandeArchive.objects.filter(*conditions, **filtres).values(*CHAMPS_COMMANDE)
+        .annotate(archivee=models.Value(True, output_field=models.BooleanField()))
+    )
+    return en_cours.union(archivees, all=True)
+
+
+def chiffre_affaires(**filtres):
+    """
+    Total des commandes livrées, archives comprises.
+    Ex: chiffre_affaires(date_commande__year=2025)
+    """
+    total = 0
+    for modele in (Commande, CommandeArchive):
+        total += (
+            modele.objects.filter(statut_commande='LIVREE', **filtres)
+            .aggregate(total=Sum('total'))['total'] or 0
+        )
+    return total
@@ -0,0 +1,43 @@
+# core_api/cache.py
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Plat
+
+# Préfixe du menu (liste des plats) mis en cache par PlatListCreateView,
+# sous forme de variantes précompressées (voir core_api/compression.py)
+MENU_CACHE_KEY = 'core_api:menu:v2'
+MENU_CACHE_TIMEOUT = 60 * 15
+# Version courante du menu, incluse dans la clé : la changer rend l'ancien menu inaccessible
+MENU_VERSION_KEY = 'core_api:menu:version'
+
+
+def cle_cache_menu():
+    """
+    Clé du menu pour la version courante. À lire AVANT de requêter les plats :
+    un menu construit pendant une modification est alors rangé sous l'ancienne
+    version, que plus personne ne lit une fois la nouvelle publiée.
+    """
+    version = cache.get_or_set(MENU_VERSION_KEY, time.time_ns, None)
+    return f'{MENU_CACHE_KEY}:{version}'
+
+
+def invalider_cache_menu():
+    """
+    Publie une nouvelle version du menu après le COMMIT. Contrairement à une
+    suppression de la clé, une lecture concurrente qui a chargé l'ancien état
+    ne peut pas le remettre en cache sous la nouvelle version.
+    """
+    transaction.on_commit(lambda: cache.set(MENU_VERSION_KEY, time.time_ns(), None))
+
+
+# Les .update() (ex: décrément du stock) ne déclenchent pas ces signaux :
+# ils doivent appeler invalider_cache_menu() eux-mêmes.
+@receiver(post_save, sender=Plat)
+@receiver(post_delete, sender=Plat)
+def plat_modifie(sender, **kwargs):
+    invalider_cache_menu()
@@ -0,0 +1,152 @@
+# core_api/compression.py
+import gzip
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+# brotli et zstandard sont optionnels : sans eux, seul gzip est proposé
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _gzip(contenu, niveau):
+    # mtime=0 : même entrée, même sortie (utile pour les ETag et les caches)
+    return gzip.compress(contenu, compresslevel=niveau, mtime=0)
+
+
+def _brotli(contenu, niveau):
+    return brotli.compress(contenu, quality=niveau)
+
+
+def _zstd(contenu, niveau):
+    return zstandard.ZstdCompressor(level=niveau).compress(contenu)
+
+
+# Encodages disponibles, par ordre de préférence du serveur
+COMPRESSEURS = {}
+if brotli is not None:
+    COMPRESSEURS['br'] = _brotli
+if zstandard is not None:
+    COMPRESSEURS['zstd'] = _zstd
+COMPRESSEURS['gzip'] = _gzip
+
+# Les réponses plus courtes ne gagnent rien à être compressées
+TAILLE_MIN = 200
+
+# Seules les réponses de l'API sont compressées à la volée. Les pages HTML (admin,
+# API navigable) contiennent un jeton CSRF et peuvent refléter la requête (?q=) :
+# les compresser ouvrirait la porte à BREACH.
+TYPES_COMPRESSES = ('application/json',)
+
+
+def choisir_encodage(accept_encoding, encodages=COMPRESSEURS):
+    """
+    Choisit l'encodage à utiliser d'après l'en-tête Accept-Encoding :
+    la plus haute valeur q, puis l'ordre de `encodages`. None = pas de compression.
+    """
+    acceptes = {}
+    for partie in accept_encoding.split(','):
+        nom, _, parametres = partie.partition(';')
+        q = 1.0
+        parametres = parametres.strip().replace(' ', '')
+        if parametres.startswith('q='):
+            try:
+                q = float(parametres[2:])
+            except ValueError:
+                q = 0.0
+        acceptes[nom.strip().lower()] = q
+
+    meilleur, meilleur_q = None, 0.0
+    for encodage in encodages:
+        q = acceptes.get(encodage, acceptes.get('*', 0.0))
+        if q > meilleur_q:
+            meilleur, meilleur_q = encodage, q
+    return meilleur
+
+
+def compresser(contenu, encodage, niveaux=None):
+    niveaux = niveaux or settings.COMPRESSION_NIVEAUX_PRECOMPRESSION
+    return COMPRESSEURS[encodage](contenu, niveaux[encodage])
+
+
+def precompresser(contenu):
+    """
+    Retourne {encodage: corps} pour tous les encodages disponibles, plus 'identity'.
+    Destiné aux réponses publiques mises en cache (sans secret ni donnée de la
+    requête, donc sans risque BREACH) : la compression n'est payée qu'une fois,
+    les lectures suivantes ne coûtent rien.
+    """
+    variantes = {'identity': contenu}
+    if len(contenu) >= TAILLE_MIN:
+        for encodage in COMPRESSEURS:
+            compresse = compresser(contenu, encodage)
+            if len(compresse) < len(contenu):
+                variantes[encodage] = compresse
+    return variantes
+
+
+def reponse_precompressee(request, variantes, content_type):
+    """
+    Construit la réponse à partir des variantes de precompresser(), selon l'Accept-Encoding
+    de la requête. CompressionMiddleware ne recompresse pas (Content-Encoding déjà présent).
+    """
+    encodage = choisir_encodage(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if encodage not in variantes:
+        encodage = 'identity'
+    response = HttpResponse(variantes[encodage], content_type=content_type)
+    if encodage != 'identity':
+        response.headers['Content-Encoding'] = encodage
+    return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresse en gzip les réponses JSON de l'API et laisse passer les variantes
+    précompressées (brotli, zstd ou gzip) de reponse_precompressee().
+    Remplace django.middleware.gzip.GZipMiddleware.
+
+    Une réponse JSON peut contenir un secret (jeton JWT) à côté de données du client :
+    comme GZipMiddleware, on ajoute un nombre aléatoire d'octets dans l'en-tête gzip
+    pour brouiller la taille compressée (atténuation de BREACH).
+    """
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if response.streaming or len(response.content) < TAILLE_MIN:
+            return response
+        content_type = response.get('Content-Type', '').partition(';')[0].strip().lower()
+        if content_type not in TYPES_COMPRESSES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        # Déjà compressée, par exemple une variante précompressée du cache
+        if response.has_header('Content-Encoding'):
+            return response
+
+        if choisir_encodage(request.META.get('HTTP_ACCEPT_ENCODING', ''), ('gzip',)) is None:
+            return response
+
+        # On ne garde la version compressée que si elle est réellement plus courte
+        contenu = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+        if len(contenu) >= len(response.content):
+            return response
+        response.content = contenu
+        response.headers['Content-Length'] = str(len(contenu))
+
+        # Un ETag fort doit devenir faible une fois le corps transformé (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
@@ -0,0 +1,32 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core_api.archives import archiver_lot
+
+
+class Command(BaseCommand):
+    help = (
+        "Déplace les commandes LIVREE/ANNULEE plus anciennes que --jours vers les tables "
+        "d'archive, par lots de --lot commandes (une transaction courte par lot)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jours', type=int, default=365, help="Âge minimal des commandes à archiver")
+        parser.add_argument('--lot', type=int, default=500, help="Nombre de commandes par transaction")
+        parser.add_argument('--pause', type=float, default=0.0, help="Secondes d'attente entre deux lots")
+
+    def handle(self, *args, **options):
+        seuil = timezone.now() - timedelta(days=options['jours'])
+        total = 0
+        while True:
+            nombre = archiver_lot(seuil, options['lot'])
+            if not nombre:
+                break
+            total += nombre
+            self.stdout.write(f"{total} commande(s) archivée(s)...")
+            if options['pause']:
+                time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(f"Terminé : {total} commande(s) archivée(s) avant le {seuil:%Y-%m-%d}."))
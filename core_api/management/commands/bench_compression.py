@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.utils.text import compress_string
+
+from core_api.compression import COMPRESSEURS, CompressionMiddleware, precompresser, reponse_precompressee
+from core_api.models import Plat
+from core_api.renderers import FastJSONRenderer
+from core_api.serializers import representation_plats
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure, pour le menu (liste des plats), les octets envoyés et le temps CPU par requête "
+        "de chaque encodage : gzip à la volée (CompressionMiddleware) contre variantes précompressées du cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        contenu = FastJSONRenderer().render(representation_plats(Plat.objects.all()))
+        self.stdout.write(f"Menu : {Plat.objects.count()} plat(s), {len(contenu)} octets sans compression\n")
+
+        self.stdout.write(f"{'encodage':<10}{'mode':<16}{'octets':>10}{'ratio':>8}{'CPU/requête':>16}")
+        debut = time.process_time()
+        for _ in range(iterations):
+            corps = compress_string(contenu, max_random_bytes=CompressionMiddleware.max_random_bytes)
+        cpu = (time.process_time() - debut) / iterations
+        self.ligne('gzip', 'à la volée', len(corps), len(contenu), cpu)
+
+        variantes = precompresser(contenu)
+        factory = RequestFactory()
+        for encodage in ['identity', *COMPRESSEURS]:
+            if encodage not in variantes:
+                continue
+            request = factory.get('/api/v1/plats/', HTTP_ACCEPT_ENCODING=encodage)
+            debut = time.process_time()
+            for _ in range(iterations):
+                response = reponse_precompressee(request, variantes, 'application/json')
+            cpu = (time.process_time() - debut) / iterations
+            self.ligne(encodage, 'précompressé', len(response.content), len(contenu), cpu)
+
+    def ligne(self, encodage, mode, octets, taille, cpu):
+        self.stdout.write(f"{encodage:<10}{mode:<16}{octets:>10}{octets / taille:>8.1%}{cpu * 1000:>13.3f} ms")
@@ -0,0 +1,123 @@
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+URL_LOGIN = '/api/v1/auth/login/'
+
+
+def tentative(url, telephone, mot_de_passe, ip):
+    """
+    Envoie une tentative de connexion. Retourne (statut HTTP, latence en secondes) ;
+    statut None si le serveur n'a pas répondu.
+    """
+    requete = urllib.request.Request(
+        url,
+        data=json.dumps({'telephone': telephone, 'password': mot_de_passe}).encode(),
+        headers={'Content-Type': 'application/json', 'X-Forwarded-For': ip},
+        method='POST',
+    )
+    debut = time.perf_counter()
+    try:
+        with urllib.request.urlopen(requete, timeout=30) as response:
+            response.read()
+            statut = response.status
+    except urllib.error.HTTPError as erreur:
+        statut = erreur.code
+    except (urllib.error.URLError, OSError):
+        statut = None
+    return statut, time.perf_counter() - debut
+
+
+class Command(BaseCommand):
+    help = (
+        "Test de charge de la connexion contre un serveur démarré : latence (p50/p95) des connexions "
+        "légitimes, seules puis pendant une attaque par bourrage d'identifiants menée par plusieurs "
+        "threads. Chaque client est identifié par X-Forwarded-For : le serveur doit être lancé avec "
+        "NUM_PROXIES=1, sinon toutes les requêtes partagent la même IP."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Adresse du serveur")
+        parser.add_argument('--telephone', required=True, help="Numéro d'un compte existant")
+        parser.add_argument('--mot-de-passe', required=True, help="Mot de passe de ce compte")
+        parser.add_argument('--connexions', type=int, default=50, help="Connexions légitimes par phase")
+        parser.add_argument('--attaquants', type=int, default=8, help="Threads d'attaque concurrents")
+        parser.add_argument('--ips-attaque', type=int, default=4, help="Adresses IP utilisées par l'attaque")
+        parser.add_argument('--debit', type=float, default=0,
+                            help="Tentatives d'attaque par seconde, tous threads confondus (0 = sans limite)")
+        parser.add_argument('--chauffe', type=float, default=10,
+                            help="Secondes d'attaque avant la mesure : les rafales autorisées par IP sont épuisées, "
+                                 "on mesure le régime établi")
+
+    def handle(self, *args, **options):
+        url = options['url'].rstrip('/') + URL_LOGIN
+        telephone, mot_de_passe = options['telephone'], options['mot_de_passe']
+        suffixe = random.randint(0, 249)
+        # Chaque connexion légitime vient d'un client différent, comme en production
+        ips_legitimes = iter(f'10.{i // 250 + 1}.{suffixe}.{i % 250 + 1}' for i in range(2 * options['connexions'] + 1))
+        ips_attaque = [f'10.66.{suffixe}.{i % 250 + 1}' for i in range(options['ips_attaque'])]
+
+        statut, _ = tentative(url, telephone, mot_de_passe, next(ips_legitimes))
+        if statut != 200:
+            raise CommandError(f"Connexion de référence refusée (statut {statut}) : vérifier --url et le compte.")
+
+        seul = [tentative(url, telephone, mot_de_passe, next(ips_legitimes)) for _ in range(options['connexions'])]
+
+        arret = threading.Event()
+        statuts_attaque = Counter()
+        verrou = threading.Lock()
+
+        # Intervalle entre deux tentatives d'un même thread pour tenir --debit
+        intervalle = options['attaquants'] / options['debit'] if options['debit'] else 0
+
+        def attaquer():
+            locaux = Counter()
+            prochaine = time.perf_counter()
+            while not arret.is_set():
+                statut, _ = tentative(url, f'victime{random.randint(0, 10 ** 6)}', 'x', random.choice(ips_attaque))
+                locaux[statut] += 1
+                if intervalle:
+                    prochaine += intervalle
+                    arret.wait(max(0, prochaine - time.perf_counter()))
+            with verrou:
+                statuts_attaque.update(locaux)
+
+        attaquants = [threading.Thread(target=attaquer, daemon=True) for _ in range(options['attaquants'])]
+        debut = time.perf_counter()
+        for thread in attaquants:
+            thread.start()
+        try:
+            arret.wait(options['chauffe'])
+            pendant = [tentative(url, telephone, mot_de_passe, next(ips_legitimes)) for _ in range(options['connexions'])]
+        finally:
+            arret.set()
+            for thread in attaquants:
+                thread.join()
+        duree = time.perf_counter() - debut
+
+        self.stdout.write("Connexions légitimes (latence en ms) :")
+        self.resume('sans attaque', seul)
+        self.resume('pendant attaque', pendant)
+
+        total = sum(statuts_attaque.values())
+        detail = ', '.join(f'{statut or "sans réponse"}: {nombre}' for statut, nombre in sorted(
+            statuts_attaque.items(), key=lambda item: item[0] or 0))
+        self.stdout.write(
+            f"Attaque : {options['attaquants']} threads, {total} tentatives en {duree:.1f} s "
+            f"({total / duree:.0f}/s) ; statuts {detail}"
+        )
+
+    def resume(self, libelle, mesures):
+        statuts = Counter(statut for statut, _ in mesures)
+        latences = sorted(latence * 1000 for _, latence in mesures)
+        p95 = latences[min(len(latences) - 1, int(len(latences) * 0.95))]
+        self.stdout.write(
+            f"  {libelle:<16} p50 {statistics.median(latences):8.1f}  p95 {p95:8.1f}  statuts {dict(statuts)}"
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core_api.stock import reinitialiser_stock
+
+
+class Command(BaseCommand):
+    help = "Remet le stock du jour de chaque plat suivi à son stock journalier (à lancer chaque matin via cron)."
+
+    def handle(self, *args, **options):
+        nombre = reinitialiser_stock()
+        self.stdout.write(self.style.SUCCESS(f"{nombre} plat(s) réinitialisé(s)."))
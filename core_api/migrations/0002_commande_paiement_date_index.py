@@ -0,0 +1,58 @@
+# Generated by Django 6.0 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+# (table, colonne) des index ajoutés : ces tables sont volumineuses, sur PostgreSQL
+# l'index est construit avec CREATE INDEX CONCURRENTLY pour ne pas bloquer les écritures.
+INDEX = [
+    ('core_api_commande', 'date_commande'),
+    ('core_api_paiement', 'date_paiement'),
+]
+
+
+def creer_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    for table, colonne in INDEX:
+        # Même nom que celui que Django donne à un index db_index=True
+        nom = schema_editor._create_index_name(table, [colonne])
+        schema_editor.execute(
+            f'CREATE INDEX {concurrently}IF NOT EXISTS {schema_editor.quote_name(nom)} '
+            f'ON {schema_editor.quote_name(table)} ({schema_editor.quote_name(colonne)})'
+        )
+
+
+def supprimer_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    for table, colonne in INDEX:
+        nom = schema_editor._create_index_name(table, [colonne])
+        schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS {schema_editor.quote_name(nom)}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('core_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(creer_index, supprimer_index),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='commande',
+                    name='date_commande',
+                    field=models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+                migrations.AlterField(
+                    model_name='paiement',
+                    name='date_paiement',
+                    field=models.DateTimeField(blank=True, db_index=True, null=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0002_commande_paiement_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plat',
+            name='stock_journalier',
+            field=models.PositiveIntegerField(blank=True, help_text='Quantité remise en stock chaque jour', null=True),
+        ),
+        migrations.AddField(
+            model_name='plat',
+            name='stock',
+            field=models.PositiveIntegerField(blank=True, help_text="Quantité restante aujourd'hui", null=True),
+        ),
+    ]
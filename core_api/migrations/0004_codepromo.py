@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0003_plat_stock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodePromo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(help_text='Saisi sans tenir compte de la casse', max_length=50, unique=True)),
+                ('description', models.CharField(blank=True, max_length=255, null=True)),
+                ('type_reduction', models.CharField(choices=[('POURCENTAGE', 'Pourcentage'), ('MONTANT', 'Montant fixe')], default='POURCENTAGE', max_length=20)),
+                ('valeur', models.DecimalField(decimal_places=2, help_text='Pourcentage (ex: 10) ou montant', max_digits=6)),
+                ('montant_minimum', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('date_debut', models.DateTimeField(blank=True, null=True)),
+                ('date_fin', models.DateTimeField(blank=True, null=True)),
+                ('utilisations_max', models.PositiveIntegerField(blank=True, null=True)),
+                ('utilisations', models.PositiveIntegerField(default=0)),
+                ('categories', models.JSONField(blank=True, default=list, help_text='Ex: ["Grillades", "Boissons"]')),
+                ('actif', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('plats', models.ManyToManyField(blank=True, related_name='codes_promo', to='core_api.plat')),
+            ],
+        ),
+    ]
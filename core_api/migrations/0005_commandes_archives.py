@@ -0,0 +1,74 @@
+# Generated by Django 6.0 on 2026-10-19 16:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0004_codepromo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommandeArchive',
+            fields=[
+                ('adresse_livraison', models.CharField(max_length=255)),
+                ('ville', models.CharField(max_length=100)),
+                ('commune', models.CharField(max_length=100)),
+                ('instructions', models.TextField(blank=True, null=True)),
+                ('statut_commande', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('CONFIRMEE', 'Confirmée'), ('EN_PREPARATION', 'En préparation'), ('EN_LIVRAISON', 'En livraison'), ('LIVREE', 'Livrée'), ('ANNULEE', 'Annulée')], default='EN_ATTENTE', max_length=20)),
+                ('date_confirmation', models.DateTimeField(blank=True, null=True)),
+                ('date_preparation', models.DateTimeField(blank=True, null=True)),
+                ('date_depart_livraison', models.DateTimeField(blank=True, null=True)),
+                ('date_livree', models.DateTimeField(blank=True, null=True)),
+                ('sous_total', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('frais_livraison', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('tva', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('total', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('livreur_position_lat', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('livreur_position_lng', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date_commande', models.DateTimeField(db_index=True)),
+                ('date_archivage', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='commandes_archivees', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LigneCommandeArchive',
+            fields=[
+                ('quantite', models.PositiveIntegerField()),
+                ('prix_unitaire', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('id_variation', models.CharField(blank=True, max_length=50, null=True)),
+                ('personnalisation', models.TextField(blank=True, null=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('commande', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lignes', to='core_api.commandearchive')),
+                ('plat', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core_api.plat')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PaiementArchive',
+            fields=[
+                ('mode', models.CharField(choices=[('AIRTEL_MONEY', 'Airtel Money'), ('MOBILE_CASH', 'Mobile Cash'), ('LIVRAISON', 'Paiement à la livraison')], max_length=20)),
+                ('montant', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('statut', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('CONFIRME', 'Confirmé'), ('ECHEC', 'Échec')], default='EN_ATTENTE', max_length=20)),
+                ('reference', models.CharField(blank=True, max_length=100, null=True)),
+                ('date_paiement', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('redirect_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('montant_en_especes', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('commande', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='paiement', to='core_api.commandearchive')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_api', '0005_commandes_archives'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='panier',
+            name='reduction',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.AlterField(
+            model_name='codepromo',
+            name='valeur',
+            field=models.DecimalField(decimal_places=2, help_text='Pourcentage (ex: 10) ou montant', max_digits=8),
+        ),
+    ]
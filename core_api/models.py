@@ -70,6 +70,10 @@ class Plat(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     variations = models.JSONField(default=list, blank=True) 
 
+    # Stock du jour : None = non suivi (illimité). Voir core_api/stock.py
+    stock_journalier = models.PositiveIntegerField(null=True, blank=True, help_text="Quantité remise en stock chaque jour")
+    stock = models.PositiveIntegerField(null=True, blank=True, help_text="Quantité restante aujourd'hui")
+
     def __str__(self):
         return self.nom
 
@@ -79,7 +83,7 @@ class Panier(models.Model):
     client = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     code_promo = models.CharField(max_length=50, blank=True, null=True)
-    reduction = models.DecimalField(max_digits=6, decimal_places=2, default=0)
+    reduction = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     
     def __str__(self):
         return f"Panier de {self.client.telephone}"
@@ -92,7 +96,9 @@ class LignePanier(models.Model):
     personnalisation = models.TextField(blank=True, null=True)
 
 # --- 5. Modèles Commande (Orders) ---
-class Commande(models.Model):
+# Les champs communs aux commandes en cours et archivées (section 9) sont dans les
+# classes abstraites *Base : l'archivage copie les lignes colonne par colonne.
+class CommandeBase(models.Model):
     STATUT_CHOICES = [
         ('EN_ATTENTE', 'En attente'),
         ('CONFIRMEE', 'Confirmée'),
@@ -102,16 +108,12 @@ class Commande(models.Model):
         ('ANNULEE', 'Annulée'),
     ]
     
-    # CORRECTION : Lier à CustomUser
-    client = models.ForeignKey(CustomUser, on_delete=models.PROTECT, related_name='commandes')
-    
     adresse_livraison = models.CharField(max_length=255)
     ville = models.CharField(max_length=100)
     commune = models.CharField(max_length=100)
     instructions = models.TextField(blank=True, null=True)
     
     statut_commande = models.CharField(max_length=20, choices=STATUT_CHOICES, default='EN_ATTENTE')
-    date_commande = models.DateTimeField(auto_now_add=True)
     date_confirmation = models.DateTimeField(null=True, blank=True)
     date_preparation = models.DateTimeField(null=True, blank=True)
     date_depart_livraison = models.DateTimeField(null=True, blank=True)
@@ -125,19 +127,32 @@ class Commande(models.Model):
     livreur_position_lat = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     livreur_position_lng = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
 
+    class Meta:
+        abstract = True
+
     def __str__(self):
         return f"Commande #{self.id} - {self.statut_commande}"
 
-class LigneCommande(models.Model):
-    commande = models.ForeignKey(Commande, on_delete=models.CASCADE, related_name='lignes')
+class Commande(CommandeBase):
+    # CORRECTION : Lier à CustomUser
+    client = models.ForeignKey(CustomUser, on_delete=models.PROTECT, related_name='commandes')
+    date_commande = models.DateTimeField(auto_now_add=True, db_index=True)
+
+class LigneCommandeBase(models.Model):
     plat = models.ForeignKey(Plat, on_delete=models.PROTECT) 
     quantite = models.PositiveIntegerField()
     prix_unitaire = models.DecimalField(max_digits=8, decimal_places=2) 
     id_variation = models.CharField(max_length=50, blank=True, null=True)
     personnalisation = models.TextField(blank=True, null=True)
 
+    class Meta:
+        abstract = True
+
+class LigneCommande(LigneCommandeBase):
+    commande = models.ForeignKey(Commande, on_delete=models.CASCADE, related_name='lignes')
+
 # --- 6. Modèle Paiement ---
-class Paiement(models.Model):
+class PaiementBase(models.Model):
     MODE_CHOICES = [
         ('AIRTEL_MONEY', 'Airtel Money'),
         ('MOBILE_CASH', 'Mobile Cash'),
@@ -149,19 +164,24 @@ class Paiement(models.Model):
         ('ECHEC', 'Échec'),
     ]
     
-    commande = models.OneToOneField(Commande, on_delete=models.CASCADE, related_name='paiement')
     mode = models.CharField(max_length=20, choices=MODE_CHOICES)
     montant = models.DecimalField(max_digits=8, decimal_places=2)
     statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='EN_ATTENTE')
     
     reference = models.CharField(max_length=100, blank=True, null=True)
-    date_paiement = models.DateTimeField(null=True, blank=True)
+    date_paiement = models.DateTimeField(null=True, blank=True, db_index=True)
     redirect_url = models.URLField(max_length=500, null=True, blank=True) 
     montant_en_especes = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True) 
 
+    class Meta:
+        abstract = True
+
     def __str__(self):
         return f"Paiement #{self.id} - {self.get_statut_display()}"
 
+class Paiement(PaiementBase):
+    commande = models.OneToOneField(Commande, on_delete=models.CASCADE, related_name='paiement')
+
 # --- 7. Modèles Utilitaires (Paramètres et Communes) ---
 class ParametresRestaurant(models.Model):
     nom_restaurant = models.CharField(max_length=100, default="Le Cube")
@@ -180,4 +200,59 @@ class Commune(models.Model):
     frais_livraison = models.DecimalField(max_digits=6, decimal_places=2)
 
     def __str__(self):
-        return self.nom
\ No newline at end of file
+        return self.nom
+
+# --- 8. Modèle Code Promo ---
+# Les règles actives sont compilées en mémoire : voir core_api/promo.py
+class CodePromo(models.Model):
+    TYPE_CHOICES = [
+        ('POURCENTAGE', 'Pourcentage'),
+        ('MONTANT', 'Montant fixe'),
+    ]
+
+    code = models.CharField(max_length=50, unique=True, help_text="Saisi sans tenir compte de la casse")
+    description = models.CharField(max_length=255, blank=True, null=True)
+    type_reduction = models.CharField(max_length=20, choices=TYPE_CHOICES, default='POURCENTAGE')
+    valeur = models.DecimalField(max_digits=8, decimal_places=2, help_text="Pourcentage (ex: 10) ou montant")
+    montant_minimum = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+
+    # Fenêtre de validité (vide = sans limite)
+    date_debut = models.DateTimeField(null=True, blank=True)
+    date_fin = models.DateTimeField(null=True, blank=True)
+
+    # Limite d'utilisation globale (vide = illimitée), incrémentée atomiquement au checkout
+    utilisations_max = models.PositiveIntegerField(null=True, blank=True)
+    utilisations = models.PositiveIntegerField(default=0)
+
+    # Restrictions : si aucune n'est définie, la réduction porte sur tout le panier
+    plats = models.ManyToManyField(Plat, blank=True, related_name='codes_promo')
+    categories = models.JSONField(default=list, blank=True, help_text='Ex: ["Grillades", "Boissons"]')
+
+    actif = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        self.code = self.code.strip().upper()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.code
+
+
+# --- 9. Archives des commandes ---
+# Commandes LIVREE/ANNULEE anciennes, déplacées par la commande archiver_commandes.
+# Les identifiants d'origine sont conservés. Lecture combinée : core_api/archives.py
+class CommandeArchive(CommandeBase):
+    id = models.BigIntegerField(primary_key=True)
+    client = models.ForeignKey(CustomUser, on_delete=models.PROTECT, related_name='commandes_archivees')
+    date_commande = models.DateTimeField(db_index=True)
+    date_archivage = models.DateTimeField(auto_now_add=True)
+
+class LigneCommandeArchive(LigneCommandeBase):
+    id = models.BigIntegerField(primary_key=True)
+    commande = models.ForeignKey(CommandeArchive, on_delete=models.CASCADE, related_name='lignes')
+
+class PaiementArchive(PaiementBase):
+    id = models.BigIntegerField(primary_key=True)
+    commande = models.OneToOneField(CommandeArchive, on_delete=models.CASCADE, related_name='paiement')
@@ -0,0 +1,78 @@
+# core_api/pagination.py
+import base64
+import binascii
+import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class HistoriqueCursorPagination(BasePagination):
+    """
+    Pagination par curseur de l'historique des commandes, triée par (-date_commande, -id).
+
+    Le curseur encode la dernière commande de la page (date|id). Le filtre qui en découle
+    doit être appliqué AVANT l'UNION ALL des commandes et des archives (un queryset
+    combiné ne se filtre plus) : la vue le passe à commandes_avec_archives() via filtre().
+    Chaque page ne lit que `page_size + 1` lignes grâce aux index sur date_commande,
+    quelle que soit sa profondeur, contrairement à un OFFSET.
+    """
+    page_size = 20
+    cursor_query_param = 'cursor'
+    ordering = ('-date_commande', '-id')
+    invalid_cursor_message = 'Curseur invalide.'
+
+    def decoder(self, request):
+        """
+        Retourne (date_commande, id) du curseur de la requête, ou None pour la première page.
+        """
+        curseur = request.query_params.get(self.cursor_query_param)
+        if not curseur:
+            return None
+        try:
+            date, _, pk = base64.urlsafe_b64decode(curseur.encode()).decode().partition('|')
+            return datetime.datetime.fromisoformat(date), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encoder(self, ligne):
+        valeur = f"{ligne['date_commande'].isoformat()}|{ligne['id']}"
+        return base64.urlsafe_b64encode(valeur.encode()).decode()
+
+    def filtre(self, request):
+        """
+        Condition des commandes situées après le curseur dans l'ordre de tri.
+        """
+        position = self.decoder(request)
+        if position is None:
+            return Q()
+        date, pk = position
+        return Q(date_commande__lt=date) | Q(date_commande=date, id__lt=pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        lignes = list(queryset[:self.page_size + 1])
+        self.suivante = lignes[self.page_size - 1] if len(lignes) > self.page_size else None
+        return lignes[:self.page_size]
+
+    def get_next_link(self):
+        if self.suivante is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encoder(self.suivante))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
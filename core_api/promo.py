@@ -0,0 +1,236 @@
+# core_api/promo.py
+import threading
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import CodePromo
+
+# Version des codes promo dans le cache partagé : changée à chaque modification,
+# elle indique aux autres processus de recompiler leurs règles.
+PROMO_VERSION_KEY = 'core_api:promo:version'
+# Délai maximal avant qu'un processus voie une modification faite par un autre
+INTERVALLE_VERIFICATION = 1.0
+
+CENTIME = Decimal('0.01')
+ZERO = Decimal('0.00')
+
+
+class CodePromoInvalide(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Ce code promo n'est pas valide."
+    default_code = 'code_promo_invalide'
+
+
+class RegleCompilee:
+    """
+    Règle d'un code promo, figée en mémoire : ensembles pour les restrictions,
+    pourcentage déjà converti en fraction. evaluer() ne fait aucune requête.
+    """
+    __slots__ = (
+        'id', 'code', 'pourcentage', 'fraction', 'montant', 'montant_minimum',
+        'debut', 'fin', 'utilisations_max', 'utilisations', 'plats', 'categories',
+    )
+
+    def __init__(self, promo):
+        self.id = promo.id
+        self.code = promo.code
+        self.pourcentage = promo.type_reduction == 'POURCENTAGE'
+        self.fraction = promo.valeur / 100
+        self.montant = promo.valeur
+        self.montant_minimum = promo.montant_minimum
+        self.debut = promo.date_debut
+        self.fin = promo.date_fin
+        self.utilisations_max = promo.utilisations_max
+        self.utilisations = promo.utilisations
+        self.plats = frozenset(plat.id for plat in promo.plats.all())
+        self.categories = frozenset(promo.categories or ())
+
+    def evaluer(self, lignes, maintenant):
+        """
+        Calcule la réduction pour des lignes (plat_id, categorie, prix, quantite).
+        Lève CodePromoInvalide si le code ne s'applique pas à ce panier.
+        """
+        if (self.debut and maintenant < self.debut) or (self.fin and maintenant >= self.fin):
+            raise CodePromoInvalide("Ce code promo a expiré ou n'est pas encore actif.")
+        # Recompilé quand la limite est atteinte ; le quota fait foi au checkout, voir utiliser_code_promo()
+        if self.utilisations_max is not None and self.utilisations >= self.utilisations_max:
+            raise CodePromoInvalide("Ce code promo a atteint sa limite d'utilisation.")
+
+        sous_total = sum((prix * quantite for _, _, prix, quantite in lignes), ZERO)
+        if sous_total < self.montant_minimum:
+            raise CodePromoInvalide(f"Ce code promo nécessite un minimum de {self.montant_minimum} d'achat.")
+
+        if self.plats or self.categories:
+            eligible = sum(
+                (prix * quantite for plat_id, categorie, prix, quantite in lignes
+                 if plat_id in self.plats or categorie in self.categories),
+                ZERO,
+            )
+            if not eligible:
+                raise CodePromoInvalide("Aucun article du panier n'est concerné par ce code promo.")
+        else:
+            eligible = sous_total
+
+        reduction = eligible * self.fraction if self.pourcentage else self.montant
+        return min(reduction, eligible).quantize(CENTIME, rounding=ROUND_HALF_UP)
+
+
+class MoteurPromo:
+    """
+    Index {code: RegleCompilee} des codes actifs, recompilé quand un code change
+    (signal local immédiat, version du cache partagé pour les autres processus).
+    """
+    def __init__(self):
+        self._regles = None
+        self._version = None
+        self._verifie_a = 0.0
+        # Une seule recompilation à la fois ; les lectures ne prennent pas le verrou
+        self._verrou = threading.Lock()
+
+    def compiler(self):
+        codes = CodePromo.objects.filter(actif=True).prefetch_related('plats')
+        return {promo.code: RegleCompilee(promo) for promo in codes}
+
+    def regles(self):
+        # invalider() peut remettre self._regles à None depuis un autre thread à tout moment :
+        # on ne lit l'attribut qu'une fois et on retourne toujours la variable locale.
+        regles = self._regles
+        maintenant = time.monotonic()
+        if regles is not None and maintenant - self._verifie_a < INTERVALLE_VERIFICATION:
+            return regles
+
+        version = cache.get(PROMO_VERSION_KEY)
+        if regles is None or version != self._version:
+            with self._verrou:
+                # Un autre thread a peut-être recompilé pendant l'attente du verrou
+                regles = self._regles
+                if regles is None or version != self._version:
+                    regles = self.compiler()
+                    self._regles = regles
+                    self._version = version
+        self._verifie_a = maintenant
+        return regles
+
+    def regle(self, code):
+        regle = self.regles().get((code or '').strip().upper())
+        if regle is None:
+            raise CodePromoInvalide()
+        return regle
+
+    def evaluer(self, code, lignes, maintenant=None):
+        return self.regle(code).evaluer(lignes, maintenant or timezone.now())
+
+    def invalider(self):
+        self._regles = None
+        cache.set(PROMO_VERSION_KEY, time.time_ns(), None)
+
+
+moteur = MoteurPromo()
+
+
+@receiver(post_save, sender=CodePromo)
+@receiver(post_delete, sender=CodePromo)
+@receiver(m2m_changed, sender=CodePromo.plats.through)
+def code_promo_modifie(sender, **kwargs):
+    transaction.on_commit(moteur.invalider)
+
+
+def prix_unitaire(prix_base, variations, id_variation):
+    """
+    Prix d'une portion : celui de la variation choisie (Plat.variations, ex:
+    {'id': 'demi', 'prix': 2000}) s'il existe, sinon le prix de base du plat.
+    Une variation inconnue (retirée du menu depuis l'ajout au panier) donne le prix de base.
+    """
+    if id_variation:
+        for variation in variations or ():
+            if not isinstance(variation, dict) or variation.get('prix') is None:
+                continue
+            if str(variation.get('id')) == id_variation:
+                return Decimal(str(variation['prix']))
+    return prix_base
+
+
+def lignes_panier(panier):
+    """
+    Lignes du panier au format attendu par RegleCompilee.evaluer(), en une requête.
+    Le prix de chaque ligne tient compte de la variation choisie (voir prix_unitaire()).
+    """
+    return [
+        (plat_id, categorie, prix_unitaire(prix_base, variations, id_variation), quantite)
+        for plat_id, categorie, prix_base, variations, id_variation, quantite in panier.items.values_list(
+            'plat_id', 'plat__categorie', 'plat__prix_base', 'plat__variations', 'id_variation', 'quantite',
+        )
+    ]
+
+
+def calculer_panier(panier, lignes=None):
+    """
+    Recalcule la réduction du panier. Un code devenu invalide (expiré, minimum non
+    atteint...) donne une réduction nulle sans être retiré du panier.
+    Retourne (sous_total, reduction).
+    """
+    if lignes is None:
+        lignes = lignes_panier(panier)
+    sous_total = sum((prix * quantite for _, _, prix, quantite in lignes), ZERO)
+
+    reduction = ZERO
+    if panier.code_promo:
+        try:
+            reduction = moteur.evaluer(panier.code_promo, lignes)
+        except CodePromoInvalide:
+            pass
+
+    if panier.reduction != reduction:
+        panier.reduction = reduction
+        panier.save(update_fields=['reduction'])
+    return sous_total, reduction
+
+
+def appliquer_code_promo(panier, code):
+    """
+    Valide le code pour ce panier et l'enregistre. Lève CodePromoInvalide sinon.
+    """
+    lignes = lignes_panier(panier)
+    regle = moteur.regle(code)
+    reduction = regle.evaluer(lignes, timezone.now())
+    panier.code_promo = regle.code
+    panier.reduction = reduction
+    panier.save(update_fields=['code_promo', 'reduction'])
+    return reduction
+
+
+def utiliser_code_promo(code):
+    """
+    Consomme une utilisation du code au checkout, en un UPDATE conditionnel :
+    deux commandes concurrentes ne peuvent pas dépasser utilisations_max.
+    À appeler dans la transaction du checkout (aucun endpoint de panier ni de checkout
+    n'existe encore dans l'API : rien ne l'appelle pour le moment).
+
+    Le compteur compilé dans RegleCompilee n'est pas mis à jour à chaque utilisation ;
+    quand la limite est atteinte, les règles sont recompilées pour que le code soit
+    refusé dès l'application au panier, et non plus seulement au checkout.
+    """
+    code = (code or '').strip().upper()
+    maintenant = timezone.now()
+    utilise = (
+        CodePromo.objects
+        .filter(code=code, actif=True)
+        .filter(Q(date_debut__isnull=True) | Q(date_debut__lte=maintenant))
+        .filter(Q(date_fin__isnull=True) | Q(date_fin__gt=maintenant))
+        .filter(Q(utilisations_max__isnull=True) | Q(utilisations__lt=F('utilisations_max')))
+        .update(utilisations=F('utilisations') + 1)
+    )
+    if not utilise:
+        raise CodePromoInvalide("Ce code promo n'est plus disponible.")
+
+    if CodePromo.objects.filter(code=code, utilisations__gte=F('utilisations_max')).exists():
+        transaction.on_commit(moteur.invalider)
@@ -0,0 +1,76 @@
+# core_api/renderers.py
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : on retombe sur le json de la stdlib
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer basé sur orjson, avec la même sortie octet pour octet que le
+    JSONRenderer de DRF (séparateurs compacts, UTF-8, \\u2028/\\u2029 échappés).
+
+    Les datetime, Decimal, etc. sont confiés à l'encodeur de DRF (encoder_class),
+    pour garder exactement le même format. Tout ce qu'orjson refuse (entiers > 64 bits,
+    clés non str...) repasse par le rendu standard.
+
+    Seules différences connues, hors des sérialiseurs du projet : les flottants en
+    notation exponentielle (1e16 au lieu de 1e+16) et NaN/Infinity rendus en null.
+    """
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if orjson is not None else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        # orjson ne sait produire que la forme compacte et non-ASCII
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # U+2028 et U+2029 s'encodent en UTF-8 en b'\xe2\x80\xa8' et b'\xe2\x80\xa9'
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser basé sur orjson pour les corps UTF-8.
+    Les autres encodages et les documents refusés par orjson passent par le
+    JSONParser de DRF, qui produit les mêmes résultats et messages d'erreur.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            utf8 = codecs.lookup(encoding).name == 'utf-8'
+        except LookupError:
+            utf8 = False
+        if orjson is None or not utf8:
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Entiers > 64 bits, NaN si STRICT_JSON est désactivé, ou JSON invalide
+            return super().parse(io.BytesIO(body), media_type, parser_context)
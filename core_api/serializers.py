@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
 from .models import Plat, Role # Importe les modèles CustomUser, Plat et Role
 
 # Récupère le modèle utilisateur défini par AUTH_USER_MODEL (CustomUser)
@@ -49,6 +50,59 @@ class UserSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+# --- REPRÉSENTATION RAPIDE (LISTES EN LECTURE SEULE) ---
+
+# Champs dont to_representation() renvoie tel quel une valeur déjà typée par l'ORM
+CHAMPS_IDENTITE = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ChoiceField, serializers.JSONField, serializers.ReadOnlyField,
+)
+
+
+class RepresentationRapide:
+    """
+    Sérialisation pré-compilée d'un ModelSerializer simple pour les listes en lecture seule.
+
+    Les champs du sérialiseur sont analysés une seule fois : on lit ensuite les lignes avec
+    values_list() (sans instancier de modèles) et seuls les champs qui transforment la
+    valeur (ex: DecimalField -> chaîne) appellent leur to_representation().
+    Le résultat est identique à Serializer(queryset, many=True).data.
+    """
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._compile = None
+
+    def compiler(self):
+        noms, sources, conversions = [], [], []
+        for nom, champ in self.serializer_class().fields.items():
+            if champ.write_only:
+                continue
+            if '.' in champ.source or champ.source == '*' or isinstance(champ, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{nom} ne peut pas être pré-compilé."
+                )
+            noms.append(nom)
+            sources.append(champ.source)
+            conversions.append(None if isinstance(champ, CHAMPS_IDENTITE) else champ.to_representation)
+        return tuple(noms), tuple(sources), tuple(conversions)
+
+    def __call__(self, queryset):
+        if self._compile is None:
+            self._compile = self.compiler()
+        noms, sources, conversions = self._compile
+
+        a_convertir = [(i, conv) for i, conv in enumerate(conversions) if conv is not None]
+        data = []
+        for ligne in queryset.values_list(*sources):
+            if a_convertir:
+                ligne = list(ligne)
+                for i, conv in a_convertir:
+                    if ligne[i] is not None:
+                        ligne[i] = conv(ligne[i])
+            data.append(dict(zip(noms, ligne)))
+        return data
+
+
 # --- SÉRIALISEUR PLAT (GÉRÉ PAR L'ADMIN) ---
 
 class PlatSerializer(serializers.ModelSerializer):
@@ -62,4 +116,27 @@ class PlatSerializer(serializers.ModelSerializer):
     class Meta:
         model = Plat
         fields = ['id', 'nom', 'description', 'prix_base', 'categorie', 'image', 'statut', 'variations']
-        # Si vous ajoutez le champ 'auteur' au modèle Plat, ajoutez 'auteur' à read_only_fields ici.
\ No newline at end of file
+        # Si vous ajoutez le champ 'auteur' au modèle Plat, ajoutez 'auteur' à read_only_fields ici.
+
+
+# --- SÉRIALISEUR HISTORIQUE DES COMMANDES (EN COURS + ARCHIVES) ---
+
+class CommandeHistoriqueSerializer(serializers.Serializer):
+    """
+    Lecture seule des dictionnaires renvoyés par core_api.archives.commandes_avec_archives().
+    """
+    id = serializers.IntegerField()
+    statut_commande = serializers.CharField()
+    date_commande = serializers.DateTimeField()
+    adresse_livraison = serializers.CharField()
+    ville = serializers.CharField()
+    commune = serializers.CharField()
+    sous_total = serializers.DecimalField(max_digits=8, decimal_places=2)
+    frais_livraison = serializers.DecimalField(max_digits=8, decimal_places=2)
+    tva = serializers.DecimalField(max_digits=8, decimal_places=2)
+    total = serializers.DecimalField(max_digits=8, decimal_places=2)
+    archivee = serializers.BooleanField()
+
+
+# Liste des plats (menu) sans le coût par champ de DRF : voir RepresentationRapide
+representation_plats = RepresentationRapide(PlatSerializer)
@@ -0,0 +1,99 @@
+# core_api/stock.py
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .cache import invalider_cache_menu
+from .models import Plat
+
+
+class StockInsuffisant(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Un ou plusieurs plats de la commande sont épuisés."
+    default_code = 'stock_insuffisant'
+
+
+def quantites_par_plat(lignes):
+    """
+    Regroupe des lignes (LignePanier, LigneCommande ou dict) par plat : {plat_id: quantité}.
+    Un même plat peut apparaître sur plusieurs lignes (variations différentes).
+    """
+    quantites = Counter()
+    for ligne in lignes:
+        if isinstance(ligne, dict):
+            quantites[ligne['plat_id']] += ligne['quantite']
+        else:
+            quantites[ligne.plat_id] += ligne.quantite
+    return dict(quantites)
+
+
+@transaction.atomic
+def reserver_stock(quantites):
+    """
+    Décrémente le stock de tous les plats d'une commande en un seul UPDATE conditionnel :
+
+        UPDATE plat SET stock = stock - n, statut = ...
+        WHERE id IN (...) AND (stock IS NULL OR stock >= n)
+
+    Le WHERE est réévalué par la base après l'attente d'un verrou : deux checkouts
+    concurrents ne peuvent pas vendre la même dernière portion. Les plats sans
+    stock suivi (stock NULL) passent toujours. Un plat qui tombe à 0 passe en EPUISE
+    dans la même requête.
+
+    Doit être appelée dans la transaction du checkout : si elle lève
+    StockInsuffisant, rien n'est décrémenté.
+    """
+    quantites = {plat_id: n for plat_id, n in quantites.items() if n > 0}
+    if not quantites:
+        return
+
+    # Verrouille les lignes dans l'ordre des id, le même pour toutes les transactions :
+    # deux commandes partageant plusieurs plats ne peuvent pas s'interbloquer.
+    ids = sorted(quantites)
+    list(Plat.objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk', flat=True))
+
+    demande = Case(*[When(pk=plat_id, then=Value(quantites[plat_id])) for plat_id in ids])
+
+    mis_a_jour = (
+        Plat.objects
+        .filter(pk__in=ids, statut='ACTIF')
+        .filter(Q(stock__isnull=True) | Q(stock__gte=demande))
+        .update(
+            stock=F('stock') - demande,
+            statut=Case(
+                When(stock=demande, then=Value('EPUISE')),
+                default=F('statut'),
+            ),
+        )
+    )
+    if mis_a_jour != len(ids):
+        # La transaction est annulée : les plats déjà décrémentés sont restaurés
+        raise StockInsuffisant()
+
+    # Chaque ligne mise à jour avait stock >= n : stock == 0 signifie qu'elle vient de s'épuiser
+    if Plat.objects.filter(pk__in=ids, stock=0).exists():
+        invalider_cache_menu()
+
+
+def reinitialiser_stock():
+    """
+    Remet chaque plat suivi à son stock journalier et réactive les plats épuisés.
+    Retourne le nombre de plats réinitialisés.
+    """
+    with transaction.atomic():
+        nombre = (
+            Plat.objects
+            .filter(stock_journalier__isnull=False)
+            .update(
+                stock=F('stock_journalier'),
+                statut=Case(
+                    When(statut='EPUISE', stock_journalier__gt=0, then=Value('ACTIF')),
+                    default=F('statut'),
+                ),
+            )
+        )
+        invalider_cache_menu()
+    return nombre
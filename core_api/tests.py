@@ -1,3 +1,625 @@
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import threading
+import time
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from . import throttling
+from .admin import EstimatedCountPaginator
+from .archives import archiver_lot, chiffre_affaires
+from .cache import cle_cache_menu
+from .compression import COMPRESSEURS, choisir_encodage
+from .models import (
+    CodePromo, Commande, CommandeArchive, CustomUser, LigneCommande, LignePanier,
+    Paiement, Panier, Plat
+)
+from .pagination import HistoriqueCursorPagination
+from .promo import (
+    CodePromoInvalide, MoteurPromo, appliquer_code_promo, calculer_panier, lignes_panier, moteur,
+    utiliser_code_promo
+)
+from .renderers import FastJSONParser, FastJSONRenderer
+from .serializers import PlatSerializer, representation_plats
+from .stock import StockInsuffisant, reserver_stock
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    La sortie doit rester identique, octet pour octet, à celle du JSONRenderer de DRF.
+    """
+    def assertMemeRendu(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_types_du_projet(self):
+        self.assertMemeRendu({
+            'prix_base': Decimal('2500.00'),
+            'total': Decimal('0.10'),
+            'date_commande': datetime.datetime(2026, 1, 5, 22, 21, 3, 123456, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2026, 1, 5),
+            'heure': datetime.time(12, 30),
+            'variations': [{'nom': 'Grande', 'prix': 500, 'dispo': True}, None],
+        })
+
+    def test_unicode_et_separateurs_de_ligne(self):
+        self.assertMemeRendu({'nom': 'Poulet braisé \u2028', 'description': 'ligne suivante \u2029'})
+
+    def test_repli_sur_le_rendu_standard(self):
+        self.assertMemeRendu({'grand_entier': 2 ** 70, 1: 'clé entière'})
+        self.assertMemeRendu({'a': [1, 2]}, 'application/json; indent=4')
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(TestCase):
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), 'application/json', {})
+
+    def test_meme_resultat(self):
+        body = '{"telephone": "0700000000", "quantite": 2, "prix": 12.5, "nom": "Sauté"}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_json_invalide(self):
+        with self.assertRaises(ParseError):
+            self.parse(FastJSONParser(), b'{"telephone": ')
+
+
+class RepresentationPlatsTests(TestCase):
+    def setUp(self):
+        Plat.objects.create(
+            nom='Poulet braisé', description='Avec attiéké', type='MENU', prix_base=Decimal('3500'),
+            categorie='Grillades', image='https://example.com/poulet.jpg',
+            variations=[{'id': 'demi', 'prix': 2000}],
+        )
+        Plat.objects.create(nom='Alloco', prix_base=Decimal('500.5'), categorie='Accompagnements', statut='EPUISE')
+
+    def test_sortie_identique_au_serialiseur(self):
+        queryset = Plat.objects.order_by('pk')
+        self.assertEqual(
+            FastJSONRenderer().render(representation_plats(queryset)),
+            JSONRenderer().render(PlatSerializer(queryset, many=True).data),
+        )
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(20):
+            Plat.objects.create(nom=f'Plat {i}', description='Sauce graine et riz ' * 5, prix_base=Decimal('1500'), categorie='Plats')
+
+    def test_choisir_encodage(self):
+        self.assertEqual(choisir_encodage('gzip, deflate'), 'gzip')
+        self.assertEqual(choisir_encodage('gzip;q=0, deflate'), None)
+        self.assertEqual(choisir_encodage('*'), next(iter(COMPRESSEURS)))
+        self.assertEqual(choisir_encodage(''), None)
+
+    def test_menu_precompresse_identique(self):
+        brut = self.client.get('/api/v1/plats/')
+        compresse = self.client.get('/api/v1/plats/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', brut)
+        self.assertEqual(compresse['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compresse['Vary'])
+        self.assertEqual(gzip.decompress(compresse.content), brut.content)
+        self.assertEqual(
+            brut.content,
+            JSONRenderer().render(PlatSerializer(Plat.objects.all(), many=True).data),
+        )
+
+    def test_menu_invalide_apres_modification(self):
+        self.client.get('/api/v1/plats/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Plat.objects.get(nom='Plat 0').delete()
+        self.assertEqual(len(self.client.get('/api/v1/plats/').json()), 19)
+
+    def test_json_compresse_en_gzip(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create(
+            username='client', telephone='0700000000', email='client@example.com', nom_complet='Client',
+        ))
+        plat = Plat.objects.create(nom='Saka-saka', description='Feuilles de manioc pilées ' * 40, prix_base=Decimal('2000'), categorie='Plats')
+        brut = client.get(f'/api/v1/plats/{plat.pk}/')
+        compresse = client.get(f'/api/v1/plats/{plat.pk}/', HTTP_ACCEPT_ENCODING='br, zstd, gzip')
+        self.assertEqual(compresse['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compresse['Vary'])
+        self.assertEqual(gzip.decompress(compresse.content), brut.content)
+
+    def test_html_non_compresse(self):
+        # Pages avec jeton CSRF et recherche reflétée : pas de compression (BREACH)
+        admin = CustomUser.objects.create_superuser(
+            username='admin', telephone='0600000000', email='admin@example.com',
+            nom_complet='Admin', password='x',
+        )
+        self.client.force_login(admin)
+        response = self.client.get('/admin/core_api/plat/?q=Plat', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn(b'csrfmiddlewaretoken', response.content)
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    LIMITES_TENTATIVES={
+        'login_ip': {'capacite': 3, 'par_minute': 1},
+        'login_ip_echecs': {'capacite': 2, 'par_minute': 1},
+        'login_telephone': {'capacite': 2, 'par_minute': 1},
+        'inscription_ip': {'capacite': 1, 'par_minute': 1},
+    },
+)
+class LimitationConnexionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        throttling._bloques.clear()
+        CustomUser.objects.create_user(
+            username='client', telephone='0700000000', email='client@example.com',
+            nom_complet='Client', password='bon-mot-de-passe',
+        )
+
+    def login(self, mot_de_passe, ip='10.0.0.1', telephone='0700000000'):
+        return self.client.post(
+            '/api/v1/auth/login/', {'telephone': telephone, 'password': mot_de_passe},
+            content_type='application/json', REMOTE_ADDR=ip,
+        )
+
+    def test_rafale_par_ip(self):
+        statuts = [self.login('bon-mot-de-passe').status_code for _ in range(4)]
+        self.assertEqual(statuts, [200, 200, 200, 429])
+        self.assertEqual(self.login('bon-mot-de-passe', ip='10.0.0.2').status_code, 200)
+
+    def test_x_forwarded_for_ignore(self):
+        # Sans proxy de confiance (NUM_PROXIES=0), changer d'en-tête ne change pas de seau
+        statuts = [
+            self.client.post(
+                '/api/v1/auth/login/', {'telephone': '0700000000', 'password': 'bon-mot-de-passe'},
+                content_type='application/json', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'192.0.2.{i}',
+            ).status_code
+            for i in range(4)
+        ]
+        self.assertEqual(statuts, [200, 200, 200, 429])
+
+        statuts = [
+            self.client.post(
+                '/api/v1/auth/register/', {}, content_type='application/json',
+                REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'192.0.2.{i}',
+            ).status_code
+            for i in range(2)
+        ]
+        self.assertEqual(statuts, [400, 429])
+
+    def test_verrouillage_du_numero_apres_echecs(self):
+        self.assertEqual(self.login('faux', ip='10.0.0.1').status_code, 401)
+        self.assertEqual(self.login('faux', ip='10.0.0.1').status_code, 401)
+        # Depuis cette IP, le numéro est verrouillé, même avec le bon mot de passe
+        response = self.login('bon-mot-de-passe', ip='10.0.0.1')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_echecs_d_un_tiers_ne_bloquent_pas_le_client(self):
+        self.assertEqual(self.login('faux', ip='10.0.0.1').status_code, 401)
+        self.assertEqual(self.login('faux', ip='10.0.0.1').status_code, 401)
+        self.assertEqual(self.login('faux', ip='10.0.0.1').status_code, 429)
+        self.assertEqual(self.login('bon-mot-de-passe', ip='10.0.0.2').status_code, 200)
+
+    def test_echecs_par_ip_tous_numeros_confondus(self):
+        # Bourrage d'identifiants : un numéro différent à chaque essai
+        statuts = [self.login('faux', telephone=f'06000000{i:02d}').status_code for i in range(3)]
+        self.assertEqual(statuts, [401, 401, 429])
+        self.assertEqual(self.login('bon-mot-de-passe', ip='10.0.0.2').status_code, 200)
+
+    def test_refus_local_sans_cache_ni_base(self):
+        for _ in range(3):
+            self.login('bon-mot-de-passe')
+        self.assertEqual(self.login('bon-mot-de-passe').status_code, 429)
+        with self.assertNumQueries(0), mock.patch.object(throttling.cache, 'get') as cache_get:
+            self.assertEqual(self.login('bon-mot-de-passe').status_code, 429)
+        cache_get.assert_not_called()
+
+    def test_table_locale_pleine_et_concurrente(self):
+        fin = time.time() + 3600
+        throttling._bloques.update((f'ancien{i}', fin) for i in range(throttling.TAILLE_MAX_BLOQUES))
+        erreurs = []
+
+        def bloquer(numero):
+            try:
+                for i in range(5000):
+                    throttling._bloquer(f'thread{numero}:{i}', fin)
+                    throttling._bloque_jusqua(f'thread{numero}:{i // 2}')
+            except Exception as exc:
+                erreurs.append(exc)
+
+        threads = [threading.Thread(target=bloquer, args=(numero,)) for numero in range(4)]
+        debut = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duree = time.perf_counter() - debut
+
+        self.assertEqual(erreurs, [])
+        self.assertEqual(len(throttling._bloques), throttling.TAILLE_MAX_BLOQUES)
+        # Éviction en tête de table : 20000 insertions sans parcourir les 10000 entrées à chaque fois
+        self.assertLess(duree, 2)
+        # Les blocages les plus anciens ont été évincés, le plus récent est conservé
+        self.assertNotIn('ancien0', throttling._bloques)
+        throttling._bloquer('dernier', fin)
+        self.assertEqual(throttling._bloque_jusqua('dernier'), fin)
+        self.assertEqual(len(throttling._bloques), throttling.TAILLE_MAX_BLOQUES)
+
+
+class CodePromoTests(TestCase):
+    def setUp(self):
+        moteur.invalider()
+        self.poulet = Plat.objects.create(nom='Poulet', prix_base=Decimal('3000'), categorie='Grillades')
+        self.jus = Plat.objects.create(nom='Jus', prix_base=Decimal('500'), categorie='Boissons')
+        client = CustomUser.objects.create_user(
+            username='client', telephone='0700000000', email='client@example.com',
+            nom_complet='Client', password='x',
+        )
+        self.panier = Panier.objects.create(client=client)
+        self.panier.items.create(plat=self.poulet, quantite=2)
+        self.panier.items.create(plat=self.jus, quantite=3)
+
+    def creer(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CodePromo.objects.create(**kwargs)
+
+    def test_pourcentage_sur_categorie(self):
+        self.creer(code='boisson20', valeur=Decimal('20'), categories=['Boissons'])
+        self.assertEqual(appliquer_code_promo(self.panier, ' Boisson20 '), Decimal('300.00'))
+        self.assertEqual(self.panier.code_promo, 'BOISSON20')
+        self.assertEqual(calculer_panier(self.panier), (Decimal('7500'), Decimal('300.00')))
+
+    def test_montant_plafonne_aux_plats_concernes(self):
+        promo = self.creer(code='JUS', type_reduction='MONTANT', valeur=Decimal('5000'))
+        with self.captureOnCommitCallbacks(execute=True):
+            promo.plats.add(self.jus)
+        self.assertEqual(appliquer_code_promo(self.panier, 'jus'), Decimal('1500.00'))
+
+    def test_grosse_reduction_enregistree(self):
+        # 20 % sur 20 x 3500 : 14000.00 dépasse l'ancien max_digits=6
+        self.panier.items.all().delete()
+        self.panier.items.create(plat=Plat.objects.create(nom='Plateau', prix_base=Decimal('3500'), categorie='Grillades'), quantite=20)
+        self.creer(code='VINGT', valeur=Decimal('20'))
+        self.assertEqual(appliquer_code_promo(self.panier, 'VINGT'), Decimal('14000.00'))
+        self.panier.clean_fields()
+        self.panier.refresh_from_db()
+        self.assertEqual(self.panier.reduction, Decimal('14000.00'))
+
+    def test_prix_de_la_variation(self):
+        # 2 demi-portions à 2000 au lieu de 2 x 3000 : sous-total 7500 -> 5500
+        Plat.objects.filter(pk=self.poulet.pk).update(variations=[{'id': 'demi', 'prix': 2000}])
+        self.panier.items.filter(plat=self.poulet).update(id_variation='demi')
+        self.creer(code='DIX', valeur=Decimal('10'))
+        self.creer(code='MINI', valeur=Decimal('10'), montant_minimum=Decimal('6000'))
+        self.assertEqual(appliquer_code_promo(self.panier, 'DIX'), Decimal('550.00'))
+        with self.assertRaises(CodePromoInvalide):
+            appliquer_code_promo(self.panier, 'MINI')
+        self.assertEqual(calculer_panier(self.panier), (Decimal('5500'), Decimal('550.00')))
+
+        # Variation retirée du menu : prix de base
+        Plat.objects.filter(pk=self.poulet.pk).update(variations=[])
+        self.assertEqual(calculer_panier(self.panier), (Decimal('7500'), Decimal('750.00')))
+
+    def test_code_invalide(self):
+        self.creer(code='MINI', valeur=Decimal('10'), montant_minimum=Decimal('10000'))
+        with self.assertRaises(CodePromoInvalide):
+            appliquer_code_promo(self.panier, 'MINI')
+        with self.assertRaises(CodePromoInvalide):
+            appliquer_code_promo(self.panier, 'INCONNU')
+
+    def test_modification_recompilee(self):
+        promo = self.creer(code='DIX', valeur=Decimal('10'))
+        self.assertEqual(appliquer_code_promo(self.panier, 'DIX'), Decimal('750.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            promo.actif = False
+            promo.save()
+        self.assertEqual(calculer_panier(self.panier)[1], Decimal('0.00'))
+
+    def test_utilisations_limitees(self):
+        self.creer(code='UNE', valeur=Decimal('10'), utilisations_max=1)
+        utiliser_code_promo('une')
+        with self.assertRaises(CodePromoInvalide):
+            utiliser_code_promo('UNE')
+        self.assertEqual(CodePromo.objects.get(code='UNE').utilisations, 1)
+
+    def test_code_epuise_refuse_au_panier(self):
+        self.creer(code='DEUX', valeur=Decimal('10'), utilisations_max=2)
+        self.assertEqual(appliquer_code_promo(self.panier, 'DEUX'), Decimal('750.00'))
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            utiliser_code_promo('DEUX')
+        # Limite non atteinte : pas de recompilation
+        self.assertEqual(callbacks, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            utiliser_code_promo('DEUX')
+        with self.assertRaisesMessage(CodePromoInvalide, "limite d'utilisation"):
+            appliquer_code_promo(self.panier, 'DEUX')
+
+    def test_invalidation_concurrente_pendant_la_lecture(self):
+        class MoteurInterrompu(MoteurPromo):
+            # Armé, simule invalider() exécuté par un autre thread juste après une lecture de _regles
+            interrompre = False
+
+            @property
+            def _regles(self):
+                regles = self.__dict__.get('stockees')
+                if self.interrompre:
+                    self.interrompre = False
+                    self.__dict__['stockees'] = None
+                return regles
+
+            @_regles.setter
+            def _regles(self, valeur):
+                self.__dict__['stockees'] = valeur
+
+        self.creer(code='DIX', valeur=Decimal('10'))
+        moteur_test = MoteurInterrompu()
+        self.assertIn('DIX', moteur_test.regles())
+        moteur_test.interrompre = True
+        self.assertIn('DIX', moteur_test.regles())
+        # La table invalidée est recompilée au prochain appel
+        self.assertEqual(moteur_test.evaluer('dix', lignes_panier(self.panier)), Decimal('750.00'))
+
+
+class ArchivageCommandesTests(TestCase):
+    def setUp(self):
+        self.client_api = CustomUser.objects.create_user(
+            username='client', telephone='0700000000', email='client@example.com',
+            nom_complet='Client', password='x',
+        )
+        self.plat = Plat.objects.create(nom='Poulet', prix_base=Decimal('3000'), categorie='Grillades')
+        self.il_y_a_deux_ans = timezone.now() - datetime.timedelta(days=730)
+        self.ancienne = self.commande('LIVREE', self.il_y_a_deux_ans)
+        self.annulee = self.commande('ANNULEE', self.il_y_a_deux_ans)
+        self.en_cours = self.commande('EN_LIVRAISON', self.il_y_a_deux_ans)
+        self.recente = self.commande('LIVREE', timezone.now())
+
+    def commande(self, statut, date):
+        commande = Commande.objects.create(
+            client=self.client_api, adresse_livraison='Rue 1', ville='Brazzaville', commune='Bacongo',
+            statut_commande=statut, sous_total=Decimal('3000'), frais_livraison=Decimal('500'),
+            tva=Decimal('0'), total=Decimal('3500'),
+        )
+        Commande.objects.filter(pk=commande.pk).update(date_commande=date)
+        commande.lignes.create(plat=self.plat, quantite=1, prix_unitaire=Decimal('3000'))
+        Paiement.objects.create(commande=commande, mode='LIVRAISON', montant=Decimal('3500'))
+        return commande
+
+    def test_archiver_par_lots(self):
+        seuil = timezone.now() - datetime.timedelta(days=365)
+        self.assertEqual(archiver_lot(seuil, 1), 1)
+        self.assertEqual(archiver_lot(seuil, 10), 1)
+        self.assertEqual(archiver_lot(seuil, 10), 0)
+
+        self.assertCountEqual(Commande.objects.values_list('pk', flat=True), [self.en_cours.pk, self.recente.pk])
+        archive = CommandeArchive.objects.get(pk=self.ancienne.pk)
+        self.assertEqual(archive.date_commande, self.il_y_a_deux_ans)
+        self.assertEqual(archive.lignes.get().plat, self.plat)
+        self.assertEqual(archive.paiement.montant, Decimal('3500'))
+        self.assertEqual(chiffre_affaires(), Decimal('7000'))
+
+    def test_historique_inclut_les_archives(self):
+        archiver_lot(timezone.now() - datetime.timedelta(days=365), 10)
+        api = APIClient()
+        api.force_authenticate(self.client_api)
+        response = api.get('/api/v1/commandes/historique/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['results']
+        self.assertEqual([c['id'] for c in data][0], self.recente.pk)
+        self.assertEqual(len(data), 4)
+        self.assertIsNone(response.json()['next'])
+        self.assertEqual(sum(c['archivee'] for c in data), 2)
+        self.assertEqual(data[0]['total'], '3500.00')
+
+    def test_historique_pagine_par_curseur(self):
+        # Même date pour plusieurs commandes : l'id départage sans doublon ni oubli
+        for _ in range(4):
+            self.commande('LIVREE', self.il_y_a_deux_ans)
+        archiver_lot(timezone.now() - datetime.timedelta(days=365), 3)
+        api = APIClient()
+        api.force_authenticate(self.client_api)
+
+        vues, url = [], '/api/v1/commandes/historique/'
+        with mock.patch.object(HistoriqueCursorPagination, 'page_size', 3):
+            while url:
+                response = api.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(len(response.json()['results']), 3)
+                vues += [(c['date_commande'], c['id']) for c in response.json()['results']]
+                url = response.json()['next']
+
+        self.assertEqual(len(vues), 8)
+        self.assertEqual(vues, sorted(vues, reverse=True))
+        self.assertEqual(len(set(vues)), 8)
+        self.assertEqual(api.get('/api/v1/commandes/historique/?cursor=invalide').status_code, 404)
+
+
+class AdminGrandesTablesTests(TestCase):
+    URLS = [
+        '/admin/core_api/commande/',
+        '/admin/core_api/paiement/',
+        '/admin/core_api/panier/',
+        '/admin/core_api/lignepanier/',
+    ]
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(
+            username='admin', telephone='0600000000', email='admin@example.com',
+            nom_complet='Admin', password='x',
+        )
+        self.client.force_login(self.admin)
+        self.plat = Plat.objects.create(nom='Poulet', prix_base=Decimal('3000'), categorie='Grillades')
+        self.nombre = 0
+
+    def ajouter_clients(self, nombre):
+        for _ in range(nombre):
+            self.nombre += 1
+            client = CustomUser.objects.create(
+                username=f'client{self.nombre}', telephone=f'07{self.nombre:08d}',
+                email=f'client{self.nombre}@example.com', nom_complet='Client',
+            )
+            commande = Commande.objects.create(
+                client=client, adresse_livraison='Rue 1', ville='Brazzaville', commune='Bacongo',
+                sous_total=Decimal('3000'), frais_livraison=Decimal('500'), tva=Decimal('0'), total=Decimal('3500'),
+            )
+            LigneCommande.objects.create(commande=commande, plat=self.plat, quantite=1, prix_unitaire=Decimal('3000'))
+            Paiement.objects.create(commande=commande, mode='LIVRAISON', montant=Decimal('3500'))
+            LignePanier.objects.create(panier=Panier.objects.create(client=client), plat=self.plat)
+
+    def test_nombre_de_requetes_constant(self):
+        self.ajouter_clients(2)
+        requetes = {}
+        for url in self.URLS:
+            with CaptureQueriesContext(connection) as contexte:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            requetes[url] = len(contexte)
+
+        self.ajouter_clients(10)
+        for url in self.URLS:
+            with self.subTest(url=url), self.assertNumQueries(requetes[url]):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_lignes_de_commande_en_une_requete(self):
+        self.ajouter_clients(1)
+        commande = Commande.objects.get()
+        for _ in range(5):
+            LigneCommande.objects.create(commande=commande, plat=self.plat, quantite=1, prix_unitaire=Decimal('3000'))
+        url = f'/admin/core_api/commande/{commande.pk}/change/'
+        with CaptureQueriesContext(connection) as contexte:
+            self.client.get(url)
+        LigneCommande.objects.create(commande=commande, plat=self.plat, quantite=1, prix_unitaire=Decimal('3000'))
+        with self.assertNumQueries(len(contexte)):
+            self.client.get(url)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for i in range(3):
+            Plat.objects.create(nom=f'Plat {i}', prix_base=Decimal('1000'), categorie='Plats')
+
+    def paginator_postgresql(self, queryset, estimation):
+        # Simule PostgreSQL avec des statistiques annonçant `estimation` lignes
+        base = mock.MagicMock(vendor='postgresql')
+        base.cursor.return_value.__enter__.return_value.fetchone.return_value = (estimation,)
+        paginator = EstimatedCountPaginator(queryset, 10)
+        with mock.patch('core_api.admin.connections', {queryset.db: base}):
+            return paginator.count
+
+    def test_estimation_sur_table_non_filtree(self):
+        self.assertEqual(self.paginator_postgresql(Plat.objects.order_by('pk'), 250000), 250000)
+
+    def test_count_exact_si_filtre(self):
+        self.assertEqual(self.paginator_postgresql(Plat.objects.filter(nom__startswith='Plat').order_by('pk'), 250000), 3)
+
+    def test_count_exact_sous_le_seuil(self):
+        self.assertEqual(self.paginator_postgresql(Plat.objects.order_by('pk'), 50), 3)
+
+    def test_count_exact_hors_postgresql(self):
+        self.assertEqual(EstimatedCountPaginator(Plat.objects.order_by('pk'), 10).count, 3)
+
+
+class StockTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.poulet = Plat.objects.create(nom='Poulet', prix_base=Decimal('3000'), categorie='Grillades', stock=5)
+        self.alloco = Plat.objects.create(nom='Alloco', prix_base=Decimal('500'), categorie='Accompagnements', stock=2)
+        self.eau = Plat.objects.create(nom='Eau', prix_base=Decimal('300'), categorie='Boissons')
+
+    def test_decrement_conditionnel(self):
+        reserver_stock({self.poulet.pk: 2, self.alloco.pk: 1})
+        self.poulet.refresh_from_db()
+        self.alloco.refresh_from_db()
+        self.assertEqual((self.poulet.stock, self.poulet.statut), (3, 'ACTIF'))
+        self.assertEqual((self.alloco.stock, self.alloco.statut), (1, 'ACTIF'))
+
+    def test_rien_decremente_si_une_ligne_echoue(self):
+        with self.assertRaises(StockInsuffisant):
+            reserver_stock({self.poulet.pk: 2, self.alloco.pk: 3})
+        self.assertEqual(
+            dict(Plat.objects.filter(pk__in=[self.poulet.pk, self.alloco.pk]).values_list('pk', 'stock')),
+            {self.poulet.pk: 5, self.alloco.pk: 2},
+        )
+
+    def test_epuise_a_zero(self):
+        reserver_stock({self.alloco.pk: 2})
+        self.alloco.refresh_from_db()
+        self.assertEqual((self.alloco.stock, self.alloco.statut), (0, 'EPUISE'))
+        with self.assertRaises(StockInsuffisant):
+            reserver_stock({self.alloco.pk: 1})
+
+    def test_stock_non_suivi(self):
+        reserver_stock({self.eau.pk: 1000, self.poulet.pk: 1})
+        self.eau.refresh_from_db()
+        self.assertEqual((self.eau.stock, self.eau.statut), (None, 'ACTIF'))
+
+    def test_plat_non_actif_refuse(self):
+        Plat.objects.filter(pk=self.eau.pk).update(statut='INACTIF')
+        with self.assertRaises(StockInsuffisant):
+            reserver_stock({self.eau.pk: 1, self.poulet.pk: 1})
+        self.poulet.refresh_from_db()
+        self.assertEqual(self.poulet.stock, 5)
+
+    def test_cache_invalide_quand_un_plat_s_epuise(self):
+        cle = cle_cache_menu()
+        with self.captureOnCommitCallbacks(execute=True):
+            reserver_stock({self.poulet.pk: 1})
+        self.assertEqual(cle_cache_menu(), cle)
+        with self.captureOnCommitCallbacks(execute=True):
+            reserver_stock({self.alloco.pk: 2})
+        self.assertNotEqual(cle_cache_menu(), cle)
+
+    def test_menu_lu_pendant_une_modification_non_reutilise(self):
+        # Une lecture concurrente prend la version et charge les plats avant le COMMIT,
+        # mais ne range l'ancien menu qu'après : il doit rester hors de la nouvelle clé.
+        cle = cle_cache_menu()
+        with self.captureOnCommitCallbacks(execute=True):
+            reserver_stock({self.alloco.pk: 2})
+        cache.set(cle, 'ancien menu')
+        self.assertIsNone(cache.get(cle_cache_menu()))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'verrous de ligne PostgreSQL requis')
+class StockConcurrenceTests(TransactionTestCase):
+    def setUp(self):
+        self.poulet = Plat.objects.create(nom='Poulet', prix_base=Decimal('3000'), categorie='Grillades', stock=1)
+        self.alloco = Plat.objects.create(nom='Alloco', prix_base=Decimal('500'), categorie='Accompagnements', stock=1)
+
+    def test_derniere_portion_vendue_une_fois_sans_interblocage(self):
+        depart = threading.Barrier(2)
+        resultats = []
+
+        def checkout(quantites):
+            try:
+                depart.wait()
+                reserver_stock(quantites)
+                resultats.append('ok')
+            except StockInsuffisant:
+                resultats.append('epuise')
+            except Exception as exc:
+                resultats.append(exc)
+            finally:
+                connection.close()
+
+        # Ordres d'insertion opposés : seul l'ordre des verrous par id évite l'interblocage
+        threads = [
+            threading.Thread(target=checkout, args=({self.poulet.pk: 1, self.alloco.pk: 1},)),
+            threading.Thread(target=checkout, args=({self.alloco.pk: 1, self.poulet.pk: 1},)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(resultats, key=str), ['epuise', 'ok'])
+        self.assertEqual(list(Plat.objects.values_list('stock', flat=True)), [0, 0])
@@ -0,0 +1,153 @@
+# core_api/throttling.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+# Tier local (par processus) : clé -> instant jusqu'auquel le seau partagé est vide.
+# Un seau vide ne peut que se remplir au rythme prévu, le blocage local est donc exact :
+# les tentatives répétées sont refusées sans accès au cache partagé, à la base ni au hachage.
+# Ordre d'insertion conservé : l'éviction ne touche que le début de la table, en O(1) amorti.
+# Partagée entre les threads du serveur (runserver, gunicorn gthread) : tout accès sous _verrou.
+_bloques = OrderedDict()
+_verrou = threading.Lock()
+TAILLE_MAX_BLOQUES = 10000
+
+
+def _bloque_jusqua(cle):
+    with _verrou:
+        return _bloques.get(cle)
+
+
+def _bloquer(cle, jusqua):
+    maintenant = time.time()
+    with _verrou:
+        _bloques[cle] = jusqua
+        _bloques.move_to_end(cle)
+        # Retire les plus anciens blocages : expirés, ou en trop si la table est pleine
+        # (ils existent encore dans le cache partagé). Un blocage expiré plus loin dans
+        # la table sera retiré quand il arrivera en tête.
+        while _bloques:
+            _, fin = next(iter(_bloques.items()))
+            if fin > maintenant and len(_bloques) <= TAILLE_MAX_BLOQUES:
+                break
+            _bloques.popitem(last=False)
+
+
+class SeauAJetonsThrottle(BaseThrottle):
+    """
+    Limitation par seau à jetons : `capacite` tentatives en rafale, puis `par_minute`
+    jetons rendus chaque minute. Les seaux sont stockés dans le cache partagé (CACHES)
+    sous forme (jetons, horodatage) ; tout est O(1) par requête.
+
+    Les paramètres viennent de settings.LIMITES_TENTATIVES[scope].
+    La lecture-écriture dans le cache n'est pas atomique : sous forte concurrence, un seau
+    peut laisser passer quelques tentatives de plus que sa capacité.
+    """
+    scope = None
+    # False : on vérifie seulement qu'un jeton est disponible (consommé par echec())
+    consommer = True
+
+    def __init__(self):
+        limite = settings.LIMITES_TENTATIVES[self.scope]
+        self.capacite = limite['capacite']
+        self.par_seconde = limite['par_minute'] / 60
+        self.attente = None
+
+    def get_cle(self, request):
+        """
+        Identifiant du seau pour cette requête, ou None pour ne pas limiter.
+        """
+        return self.get_ident(request)
+
+    def cache_key(self, request):
+        cle = self.get_cle(request)
+        if cle is None:
+            return None
+        # La clé vient du client (téléphone) : on la hache pour borner sa taille et ses caractères
+        return f'throttle:{self.scope}:{hashlib.md5(cle.encode()).hexdigest()}'
+
+    def prendre(self, cle, consommer=True):
+        """
+        Prend un jeton dans le seau `cle`. Retourne 0 si c'est permis, sinon le nombre
+        de secondes avant qu'un jeton soit disponible.
+        """
+        maintenant = time.time()
+        jusqua = _bloque_jusqua(cle)
+        if jusqua is not None and jusqua > maintenant:
+            return jusqua - maintenant
+
+        jetons, horodatage = cache.get(cle) or (self.capacite, maintenant)
+        jetons = min(self.capacite, jetons + (maintenant - horodatage) * self.par_seconde)
+        if jetons < 1:
+            attente = (1 - jetons) / self.par_seconde
+            _bloquer(cle, maintenant + attente)
+            return attente
+
+        if consommer:
+            # Au-delà de ce délai, le seau est plein : une clé absente du cache suffit
+            duree_remplissage = (self.capacite - jetons + 1) / self.par_seconde
+            cache.set(cle, (jetons - 1, maintenant), int(duree_remplissage) + 1)
+        return 0
+
+    def allow_request(self, request, view):
+        cle = self.cache_key(request)
+        if cle is None:
+            return True
+        self.attente = self.prendre(cle, self.consommer)
+        return not self.attente
+
+    def echec(self, request):
+        """
+        Consomme un jeton après coup (ex: mot de passe refusé).
+        """
+        cle = self.cache_key(request)
+        if cle is not None:
+            self.prendre(cle)
+
+    def wait(self):
+        return self.attente
+
+
+class LoginIPThrottle(SeauAJetonsThrottle):
+    scope = 'login_ip'
+
+
+class LoginIPEchecsThrottle(SeauAJetonsThrottle):
+    """
+    Échecs de connexion par IP : seuls les mots de passe refusés consomment un jeton
+    (voir LoginView). Chaque échec coûte un hachage complet du mot de passe, même pour
+    un numéro inconnu : ce seau, plus strict que LoginIPThrottle, borne ce que
+    l'attaque peut prendre au CPU des connexions légitimes.
+    """
+    scope = 'login_ip_echecs'
+    consommer = False
+
+
+class LoginTelephoneThrottle(SeauAJetonsThrottle):
+    """
+    Verrouillage d'un numéro depuis une IP : seuls les échecs consomment un jeton
+    (voir LoginView), les connexions réussies ne rapprochent donc jamais du blocage.
+
+    Le seau est celui du couple (numéro, IP) et non du numéro seul : sinon n'importe qui
+    pourrait empêcher un client de se connecter en échouant exprès sur son numéro.
+    Contrepartie : un attaquant disposant de N adresses dispose de N fois `capacite`
+    essais sur un même numéro, chaque adresse restant bornée par LoginIPEchecsThrottle.
+    """
+    scope = 'login_telephone'
+    consommer = False
+
+    def get_cle(self, request):
+        data = request.data
+        telephone = data.get('telephone') if hasattr(data, 'get') else None
+        if not isinstance(telephone, str) or not telephone.strip():
+            return None
+        return f'{telephone.strip()}|{self.get_ident(request)}'
+
+
+class InscriptionIPThrottle(SeauAJetonsThrottle):
+    scope = 'inscription_ip'
@@ -2,7 +2,8 @@ from django.urls import path
 from .views import (
     RegisterView,
     PlatListCreateView,
-    PlatRetrieveUpdateDestroyView
+    PlatRetrieveUpdateDestroyView,
+    HistoriqueCommandesView
 )
 
 urlpatterns = [
@@ -12,4 +13,7 @@ urlpatterns = [
     # PLATS
     path('plats/', PlatListCreateView.as_view(), name='plat_list_create'),
     path('plats/<int:pk>/', PlatRetrieveUpdateDestroyView.as_view(), name='plat_retrieve_update_destroy'),
+
+    # COMMANDES
+    path('commandes/historique/', HistoriqueCommandesView.as_view(), name='commande_historique'),
 ]
\ No newline at end of file
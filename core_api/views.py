@@ -1,13 +1,23 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 # Import de nos modèles et sérialiseurs
+from .archives import commandes_avec_archives
+from .cache import MENU_CACHE_TIMEOUT, cle_cache_menu
+from .compression import precompresser, reponse_precompressee
 from .models import Plat
+from .pagination import HistoriqueCursorPagination
+from .throttling import InscriptionIPThrottle, LoginIPEchecsThrottle, LoginIPThrottle, LoginTelephoneThrottle
 from .serializers import (
     UserSerializer,
-    PlatSerializer
+    PlatSerializer,
+    CommandeHistoriqueSerializer,
+    representation_plats
 )
 
 # --- Permissions Personnalisées ---
@@ -29,10 +39,34 @@ class RegisterView(generics.CreateAPIView):
     queryset = get_user_model().objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.AllowAny] 
+    throttle_classes = [InscriptionIPThrottle]
 
     def perform_create(self, serializer):
         serializer.save()
 
+class LoginView(TokenObtainPairView):
+    """
+    Connexion JWT (telephone + mot de passe) avec limitation des tentatives.
+    Les tentatives refusées par les throttles ne touchent ni la base ni le hachage du mot de passe.
+    """
+    throttle_classes = [LoginIPThrottle, LoginIPEchecsThrottle, LoginTelephoneThrottle]
+
+    def check_throttles(self, request):
+        # Contrairement à DRF, on s'arrête au premier refus : une IP bloquée localement
+        # ne coûte ni lecture du corps ni accès au cache partagé.
+        for throttle in self.get_throttles():
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
+
+    def post(self, request, *args, **kwargs):
+        try:
+            return super().post(request, *args, **kwargs)
+        except AuthenticationFailed:
+            # Mauvais identifiants : compte pour les échecs de l'IP et le verrouillage du numéro
+            LoginIPEchecsThrottle().echec(request)
+            LoginTelephoneThrottle().echec(request)
+            raise
+
 # --- 2. VUES DE GESTION DES PLATS (CRUD) ---
 
 class PlatListCreateView(generics.ListCreateAPIView):
@@ -53,6 +87,24 @@ class PlatListCreateView(generics.ListCreateAPIView):
         # Utilise IsAuthenticated et IsAdmin, car la permission par défaut du projet est IsAuthenticated
         return [permissions.IsAuthenticated(), IsAdmin()] 
 
+    def list(self, request, *args, **kwargs):
+        """
+        Le menu est lu à chaque ouverture de l'application : il est mis en cache
+        et invalidé à chaque modification d'un plat (voir core_api/cache.py).
+        Le cache contient le JSON déjà rendu et compressé dans chaque encodage.
+        """
+        renderer = request.accepted_renderer
+        if renderer.format != 'json' or renderer.get_indent(request.accepted_media_type, {}) is not None:
+            # API navigable ou JSON indenté : rendu classique, hors cache
+            return Response(representation_plats(self.get_queryset()))
+
+        cle = cle_cache_menu()
+        variantes = cache.get(cle)
+        if variantes is None:
+            variantes = precompresser(renderer.render(representation_plats(self.get_queryset())))
+            cache.set(cle, variantes, MENU_CACHE_TIMEOUT)
+        return reponse_precompressee(request, variantes, content_type=renderer.media_type)
+
     def perform_create(self, serializer):
         serializer.save(auteur=self.request.user)
 
@@ -72,4 +124,22 @@ class PlatRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         """
         if self.request.method == 'GET':
             return [permissions.AllowAny()]
-        return [permissions.IsAuthenticated(), IsAdmin()]
\ No newline at end of file
+        return [permissions.IsAuthenticated(), IsAdmin()]
+
+
+# --- 3. VUES DES COMMANDES ---
+
+class HistoriqueCommandesView(generics.ListAPIView):
+    """
+    Historique des commandes du client connecté, y compris les commandes archivées,
+    de la plus récente à la plus ancienne, par pages de 20 (?cursor=... pour la suivante).
+    """
+    serializer_class = CommandeHistoriqueSerializer
+    pagination_class = HistoriqueCursorPagination
+
+    def get_queryset(self):
+        # Le curseur filtre chaque table avant l'UNION ALL (voir HistoriqueCursorPagination)
+        return (
+            commandes_avec_archives(self.paginator.filtre(self.request), client=self.request.user)
+            .order_by(*self.paginator.ordering)
+        )
@@ -51,6 +51,8 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', 
     
     'django.middleware.security.SecurityMiddleware',
+    # Compression gzip des réponses JSON (doit précéder les middlewares qui lisent le corps)
+    'core_api.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -88,6 +90,12 @@ DATABASES = {
 }
 
 
+# Cache partagé entre les processus (ex: redis://127.0.0.1:6379/1) : menu, limitation des tentatives
+CACHES = {
+    'default': env.cache_url('CACHE_URL', default='locmemcache://'),
+}
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -120,6 +128,25 @@ USE_TZ = True
 STATIC_URL = 'static/'
 
 
+# Compression des réponses (core_api/compression.py)
+# Les réponses JSON sont compressées à la volée en gzip par CompressionMiddleware.
+# Réponses mises en cache (menu) : compressées une seule fois, on peut viser haut.
+# brotli ('br') et zstd ne sont utilisés que si les paquets brotli / zstandard sont installés
+COMPRESSION_NIVEAUX_PRECOMPRESSION = {'br': 9, 'zstd': 12, 'gzip': 9}
+
+
+# Limitation des tentatives de connexion/inscription (core_api/throttling.py)
+# Seaux à jetons : 'capacite' tentatives en rafale, puis 'par_minute' jetons rendus par minute
+LIMITES_TENTATIVES = {
+    'login_ip': {'capacite': 20, 'par_minute': 10},
+    # Échecs par IP : chacun coûte un hachage de mot de passe, d'où une limite plus stricte
+    'login_ip_echecs': {'capacite': 5, 'par_minute': 1},
+    # Par couple (numéro de téléphone, IP) : seuls les échecs sont comptés
+    'login_telephone': {'capacite': 5, 'par_minute': 1},
+    'inscription_ip': {'capacite': 5, 'par_minute': 1},
+}
+
+
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True 
 
@@ -135,7 +162,21 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         # Définit l'authentification requise par défaut pour tous les endpoints
         'rest_framework.permissions.IsAuthenticated',
-    )
+    ),
+    # Rendu/lecture JSON via orjson (même sortie que les classes DRF, repli sur la stdlib)
+    'DEFAULT_RENDERER_CLASSES': (
+        'core_api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core_api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Nombre de proxys de confiance devant l'application (ex: 1 derrière nginx).
+    # À 0, l'IP des limitations (core_api/throttling.py) est REMOTE_ADDR : l'en-tête
+    # X-Forwarded-For, fourni par le client, est ignoré et ne permet pas de changer de seau.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
 }
 
 SIMPLE_JWT = {